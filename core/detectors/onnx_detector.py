@@ -9,6 +9,26 @@ from typing import List, Dict, Tuple, Optional
 import time
 
 
+def _prefer_ort_format(model_path: str) -> str:
+    """
+    Use the ORT-format sibling of an ONNX model when one has been generated
+
+    The .ort file is only used if it is at least as new as the .onnx file,
+    so a re-exported model is never shadowed by a stale conversion.
+    """
+    ort_path = os.path.splitext(model_path)[0] + '.ort'
+    if ort_path == model_path or not os.path.exists(ort_path):
+        return model_path
+
+    if (os.path.exists(model_path)
+            and os.path.getmtime(ort_path) < os.path.getmtime(model_path)):
+        print(f"Ignoring stale ORT model {ort_path} (older than {model_path})")
+        return model_path
+
+    print(f"Using ORT-format model {ort_path} in place of {model_path}")
+    return ort_path
+
+
 class ONNXYOLODetector:
     """ONNX Runtime-based YOLO detector for optimized inference"""
 
@@ -25,10 +45,12 @@ class ONNXYOLODetector:
         self.iou_thres = iou_thres
 
         # Normalize path for Windows
-        model_path = os.path.normpath(model_path)
+        model_path = _prefer_ort_format(os.path.normpath(model_path))
 
         # Initialize ONNX Runtime session
-        providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+        # XNNPACK provides NEON-accelerated kernels on ARM (Raspberry Pi 5)
+        providers = ['CUDAExecutionProvider',
+                     'XnnpackExecutionProvider', 'CPUExecutionProvider']
         providers = [
             p for p in providers if p in ort.get_available_providers()]
 
@@ -376,10 +398,12 @@ class ONNXAmbulanceDetector:
         self.conf_thres = conf_thres
 
         # Normalize path for Windows
-        model_path = os.path.normpath(model_path)
+        model_path = _prefer_ort_format(os.path.normpath(model_path))
 
         # Initialize ONNX Runtime session
-        providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+        # XNNPACK provides NEON-accelerated kernels on ARM (Raspberry Pi 5)
+        providers = ['CUDAExecutionProvider',
+                     'XnnpackExecutionProvider', 'CPUExecutionProvider']
         providers = [
             p for p in providers if p in ort.get_available_providers()]
 
@@ -4,7 +4,10 @@ SINGLE-LANE MODE: Dynamic timing only for selected lane.
 Other lanes use DEFAULT 35 seconds.
 """
 
+import asyncio
 import logging
+import time
+from collections import deque
 from typing import Dict, Optional
 from datetime import datetime
 
@@ -13,6 +16,10 @@ from traffic_signals.core.indian_traffic_signal import IntersectionController
 
 logger = logging.getLogger(__name__)
 
+# Wall-clock timestamps within this many seconds of each other share one
+# datetime (history and status are reported at coarser resolution anyway)
+NOW_CACHE_SECONDS = 0.05
+
 
 class DynamicTimingIntegration:
     """
@@ -28,6 +35,25 @@ class DynamicTimingIntegration:
     6. Frontend shows adjusted timing in real-time
     """
 
+    # Fixed attribute layout: one long-lived instance read on every detection
+    __slots__ = (
+        'signal_controller',
+        'selected_lane',
+        'dynamic_timing_enabled',
+        'timing_calculator',
+        'vehicle_count_selected_lane',
+        'timing_updates',
+        'last_update_timestamp',
+        'vehicle_count_history',
+        '_phase_key',
+        '_detection_zone',
+        '_lane_upper',
+        '_last_green_time',
+        '_phase_timings_snapshot',
+        '_last_now_monotonic',
+        '_last_now_dt',
+    )
+
     # Mapping: Selected Lane → Signal Phase
     LANE_MAPPING = {
         'north': {
@@ -48,31 +74,55 @@ class DynamicTimingIntegration:
         },
     }
 
+    VALID_LANES = frozenset(LANE_MAPPING)
+
+    # Shared error responses (treat as read-only)
+    _ERR_INVALID_LANE = {'status': 'error', 'message': 'Invalid lane'}
+    _ERR_NO_LANE = {'status': 'error', 'message': 'No lane selected'}
+
+    # Flattened view of LANE_MAPPING: lane → ordinal, ordinal → (zone, phase)
+    _LANE_IDX = {lane: idx for idx, lane in enumerate(LANE_MAPPING)}
+    _LANE_TABLE = tuple(
+        (mapping['detection_zone'], mapping['signal_phase'])
+        for mapping in LANE_MAPPING.values()
+    )
+
     def __init__(self, signal_controller: IntersectionController):
         """Initialize dynamic timing integration."""
         self.signal_controller = signal_controller
         self.selected_lane: Optional[str] = None
+        self._phase_key: Optional[str] = None
+        self._detection_zone: Optional[str] = None
+        self._lane_upper: Optional[str] = None
         self.dynamic_timing_enabled = False
         self.timing_calculator: Optional[DynamicTimingCalculator] = None
         self.vehicle_count_selected_lane = 0
         self.timing_updates = 0
         self.last_update_timestamp = None
-        self.vehicle_count_history = []
+        self._last_green_time: Optional[int] = None
+        # Copy of controller phase timings served to status polls; rebuilt
+        # only after this class writes a new timing
+        self._phase_timings_snapshot: Optional[Dict] = None
+        self._last_now_monotonic = 0.0
+        self._last_now_dt: Optional[datetime] = None
+        # Only the most recent samples are reported, so keep a bounded window
+        self.vehicle_count_history = deque(maxlen=20)
 
         logger.info("✅ Dynamic Timing Integration initialized")
         logger.info("   SINGLE-LANE MODE: Waiting for lane selection")
 
     def select_lane(self, lane: str) -> Dict:
         """Select a lane for dynamic timing."""
-        if lane not in self.LANE_MAPPING:
-            return {
-                'status': 'error',
-                'message': f'Invalid lane: {lane}'
-            }
+        lane_idx = self._LANE_IDX.get(lane)
+        if lane_idx is None:
+            return self._ERR_INVALID_LANE
 
         self.selected_lane = lane
+        self._detection_zone, self._phase_key = self._LANE_TABLE[lane_idx]
+        self._lane_upper = lane.upper()
         self.dynamic_timing_enabled = True
         self.vehicle_count_selected_lane = 0
+        self._last_green_time = None
         self.timing_calculator = DynamicTimingCalculator(
             base_cycle_time=90,
             min_green=15,
@@ -82,40 +132,42 @@ class DynamicTimingIntegration:
             smoothing_window=5
         )
 
-        mapping = self.LANE_MAPPING[lane]
-        logger.info(f"\n🎯 LANE SELECTED: {lane.upper()}")
-        logger.info(f"  Detection Zone: {mapping['detection_zone']}")
-        logger.info(f"  Signal Phase: {mapping['signal_phase']}")
+        logger.info(f"\n🎯 LANE SELECTED: {self._lane_upper}")
+        logger.info(f"  Detection Zone: {self._detection_zone}")
+        logger.info(f"  Signal Phase: {self._phase_key}")
         logger.info(f"  Other directions: DEFAULT 35 seconds\n")
 
         return {
             'status': 'success',
             'selected_lane': lane,
-            'detection_zone': mapping['detection_zone'],
-            'signal_phase': mapping['signal_phase']
+            'detection_zone': self._detection_zone,
+            'signal_phase': self._phase_key
         }
 
     def update_vehicle_count(self, vehicle_count: int) -> Dict:
         """Update vehicle count for selected lane and adjust timing."""
         if not self.selected_lane or not self.dynamic_timing_enabled:
-            return {
-                'status': 'error',
-                'message': 'No lane selected'
-            }
+            return self._ERR_NO_LANE
 
         old_count = self.vehicle_count_selected_lane
         self.vehicle_count_selected_lane = max(0, vehicle_count)
+        timestamp = self._now_cached()
 
-        self.vehicle_count_history.append({
-            'timestamp': datetime.now(),
-            'count': vehicle_count
-        })
+        timing = self._calculate_and_apply_timing(vehicle_count)
 
-        if abs(vehicle_count - old_count) > 1:
-            logger.info(
-                f"🚗 {self.selected_lane.upper()}: {old_count} → {vehicle_count} vehicles")
+        # History and logging don't affect the response; when called from a
+        # request handler, run them after the handler has returned
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
 
-        timing = self._calculate_and_apply_timing(vehicle_count)
+        if loop is None:
+            self._post_update_side_effects(
+                self.selected_lane, timestamp, old_count, vehicle_count)
+        else:
+            loop.call_soon(self._post_update_side_effects,
+                           self.selected_lane, timestamp, old_count, vehicle_count)
 
         return {
             'status': 'success',
@@ -124,24 +176,55 @@ class DynamicTimingIntegration:
             'timing': timing,
         }
 
+    def _post_update_side_effects(
+        self,
+        lane: str,
+        timestamp: datetime,
+        old_count: int,
+        vehicle_count: int
+    ) -> None:
+        """Record a vehicle count update in history and the log."""
+        # Selection may have changed before a deferred call runs
+        if lane != self.selected_lane:
+            return
+
+        self.vehicle_count_history.append({
+            'timestamp': timestamp.isoformat(),
+            'count': vehicle_count
+        })
+
+        if abs(vehicle_count - old_count) > 1:
+            logger.info("🚗 %s: %d → %d vehicles",
+                        self._lane_upper, old_count, vehicle_count)
+
+    def _now_cached(self) -> datetime:
+        """Return datetime.now(), reusing the last value for a few milliseconds."""
+        now_monotonic = time.monotonic()
+        if (self._last_now_dt is None
+                or now_monotonic - self._last_now_monotonic > NOW_CACHE_SECONDS):
+            self._last_now_dt = datetime.now()
+            self._last_now_monotonic = now_monotonic
+        return self._last_now_dt
+
     def _calculate_and_apply_timing(self, vehicle_count: int) -> Dict:
         """Calculate optimal timing and apply to signal controller."""
         if not self.timing_calculator:
             return {}
 
         timing_config = self.timing_calculator.calculate_timing(vehicle_count)
+
         green_time = timing_config['green_duration']
         congestion = timing_config['congestion_level']
 
-        self._apply_timing_to_controller(green_time)
+        # Counts often flicker within one congestion band; only push deltas
+        if green_time != self._last_green_time:
+            self._apply_timing_to_controller(green_time)
 
-        logger.info(
-            f"✅ {self.selected_lane.upper()}: {vehicle_count} vehicles → "
-            f"GREEN: {green_time}s ({congestion})"
-        )
+            logger.info("✅ %s: %d vehicles → GREEN: %ds (%s)",
+                        self._lane_upper, vehicle_count, green_time, congestion)
 
-        self.timing_updates += 1
-        self.last_update_timestamp = datetime.now()
+            self.timing_updates += 1
+            self.last_update_timestamp = self._now_cached()
 
         return {
             'green_duration': green_time,
@@ -158,20 +241,21 @@ class DynamicTimingIntegration:
             if not hasattr(self.signal_controller, 'phase_timings'):
                 return
 
-            mapping = self.LANE_MAPPING[self.selected_lane]
-            phase_key = mapping['signal_phase']
+            phase_key = self._phase_key
 
             if phase_key in self.signal_controller.phase_timings:
                 old_timing = self.signal_controller.phase_timings[phase_key]
                 self.signal_controller.phase_timings[phase_key] = green_time
+                self._phase_timings_snapshot = None
+
+                if old_timing != green_time and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📡 %s GREEN: %ss → %ds",
+                                 self._lane_upper, old_timing, green_time)
 
-                if old_timing != green_time:
-                    logger.debug(
-                        f"📡 {self.selected_lane.upper()} GREEN: {old_timing}s → {green_time}s"
-                    )
+            self._last_green_time = green_time
 
         except Exception as e:
-            logger.error(f"Error applying timing: {e}")
+            logger.error("Error applying timing: %s", e)
 
     def get_current_status(self) -> Dict:
         """Get current status."""
@@ -183,27 +267,31 @@ class DynamicTimingIntegration:
             'selected_lane': self.selected_lane,
             'vehicle_count': self.vehicle_count_selected_lane,
             'total_updates': self.timing_updates,
-            'phase_timings': dict(self.signal_controller.phase_timings),
+            'phase_timings': self._get_phase_timings_snapshot(),
         }
 
         if self.timing_calculator and self.timing_calculator.last_calculated_timing:
             status['timing'] = {
                 'green': self.timing_calculator.last_calculated_timing.green_duration,
-                'congestion': self.timing_calculator.last_calculated_timing.congestion_level.value,
+                'congestion': self.timing_calculator.last_calculated_timing.congestion_level.name,
             }
 
         return status
 
+    def _get_phase_timings_snapshot(self) -> Dict:
+        """Return a cached copy of the controller's phase timings."""
+        if self._phase_timings_snapshot is None:
+            self._phase_timings_snapshot = dict(
+                self.signal_controller.phase_timings)
+        return self._phase_timings_snapshot
+
     def get_statistics(self) -> Dict:
         """Get statistics."""
         stats = {
             'timestamp': datetime.now().isoformat(),
             'selected_lane': self.selected_lane,
             'total_timing_updates': self.timing_updates,
-            'vehicle_count_history': [
-                {'timestamp': h['timestamp'].isoformat(), 'count': h['count']}
-                for h in self.vehicle_count_history[-20:]
-            ]
+            'vehicle_count_history': list(self.vehicle_count_history)
         }
 
         if self.timing_calculator:
@@ -215,11 +303,15 @@ class DynamicTimingIntegration:
     def reset_selection(self) -> None:
         """Reset selection."""
         self.selected_lane = None
+        self._phase_key = None
+        self._detection_zone = None
+        self._lane_upper = None
         self.dynamic_timing_enabled = False
         self.timing_calculator = None
         self.vehicle_count_selected_lane = 0
         self.timing_updates = 0
-        self.vehicle_count_history = []
+        self._last_green_time = None
+        self.vehicle_count_history.clear()
         logger.info("🔄 Dynamic timing reset")
 
     def __repr__(self) -> str:
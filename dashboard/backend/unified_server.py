@@ -28,6 +28,12 @@ from datetime import datetime
 # Third-party imports
 from aiohttp import web
 
+# Optional: uvloop is a faster drop-in event loop (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Dashboard imports (path is now set up)
 from dashboard.backend.api_routes import DashboardAPI, cors_middleware
 from dashboard.backend.stream_manager import StreamManager
@@ -278,7 +284,7 @@ class UnifiedDashboardServer:
             data = await request.json()
             lane = data.get('lane', '').lower()
 
-            if lane not in ['north', 'south', 'east', 'west']:
+            if lane not in DynamicTimingIntegration.VALID_LANES:
                 return web.json_response(
                     {'error': f'Invalid lane: {lane}'},
                     status=400
@@ -306,6 +312,31 @@ class UnifiedDashboardServer:
                 status=500
             )
 
+    def _apply_vehicle_count(self, vehicle_count) -> web.Response:
+        """Apply a vehicle count for the selected lane and build the timing response."""
+        if self.dynamic_timing.selected_lane is None:
+            return web.json_response(
+                {'error': 'No lane selected. Call /api/signals/select-lane first'},
+                status=400
+            )
+
+        # Update dynamic timing with vehicle count for selected lane
+        result = self.dynamic_timing.update_vehicle_count(vehicle_count)
+
+        if result['status'] != 'success':
+            return web.json_response(result, status=400)
+
+        # Return timing information
+        response = {
+            'success': True,
+            'selected_lane': result['selected_lane'],
+            'vehicle_count': vehicle_count,
+            'timing': result['timing'],
+            'message': f'Timing updated for {result["selected_lane"]} with {vehicle_count} vehicles',
+        }
+
+        return web.json_response(response, status=200)
+
     async def _handle_vehicle_count_update(self, request: web.Request) -> web.Response:
         """
         Update vehicle count for selected lane and adjust signal timing dynamically.
@@ -315,30 +346,48 @@ class UnifiedDashboardServer:
         """
         try:
             data = await request.json()
-            vehicle_count = data.get('count', 0)
+            return self._apply_vehicle_count(data.get('count', 0))
+
+        except json.JSONDecodeError:
+            return web.json_response(
+                {'error': 'Invalid JSON'},
+                status=400
+            )
+        except Exception as e:
+            logger.error(f"Error updating vehicle count: {e}")
+            return web.json_response(
+                {'error': str(e)},
+                status=500
+            )
+
+    async def _handle_vehicle_counts_update(self, request: web.Request) -> web.Response:
+        """
+        Update vehicle counts for several lanes in a single request.
+
+        POST /api/signals/vehicle-counts
+        JSON: {"counts": {"north": 8, "south": 12, "east": 25, "west": 3}}
+
+        In single-lane mode only the selected lane's count drives the timing;
+        counts for the other lanes are accepted and ignored.
+        """
+        try:
+            data = await request.json()
+            counts = data.get('counts') or {}
 
-            if self.dynamic_timing.selected_lane is None:
+            if not isinstance(counts, dict):
                 return web.json_response(
-                    {'error': 'No lane selected. Call /api/signals/select-lane first'},
+                    {'error': "'counts' must be an object mapping lane to count"},
                     status=400
                 )
 
-            # Update dynamic timing with vehicle count for selected lane
-            result = self.dynamic_timing.update_vehicle_count(vehicle_count)
-
-            if result['status'] != 'success':
-                return web.json_response(result, status=400)
-
-            # Return timing information
-            response = {
-                'success': True,
-                'selected_lane': result['selected_lane'],
-                'vehicle_count': vehicle_count,
-                'timing': result['timing'],
-                'message': f'Timing updated for {result["selected_lane"]} with {vehicle_count} vehicles',
-            }
+            selected_lane = self.dynamic_timing.selected_lane
+            if selected_lane is not None and selected_lane not in counts:
+                return web.json_response(
+                    {'error': f'No count provided for selected lane: {selected_lane}'},
+                    status=400
+                )
 
-            return web.json_response(response, status=200)
+            return self._apply_vehicle_count(counts.get(selected_lane))
 
         except json.JSONDecodeError:
             return web.json_response(
@@ -346,7 +395,7 @@ class UnifiedDashboardServer:
                 status=400
             )
         except Exception as e:
-            logger.error(f"Error updating vehicle count: {e}")
+            logger.error(f"Error updating vehicle counts: {e}")
             return web.json_response(
                 {'error': str(e)},
                 status=500
@@ -399,6 +448,8 @@ class UnifiedDashboardServer:
                             self._handle_select_lane)
         app.router.add_post('/api/signals/vehicle-count',
                             self._handle_vehicle_count_update)
+        app.router.add_post('/api/signals/vehicle-counts',
+                            self._handle_vehicle_counts_update)
         app.router.add_get('/api/signals/dynamic-timing/status',
                            self._handle_dynamic_timing_status)
         app.router.add_get('/api/signals/dynamic-timing/stats',
@@ -601,6 +652,13 @@ if __name__ == '__main__':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
     try:
-        asyncio.run(main())
+        if uvloop is None:
+            asyncio.run(main())
+        elif sys.version_info >= (3, 11):
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                runner.run(main())
+        else:
+            uvloop.install()
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
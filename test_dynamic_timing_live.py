@@ -5,51 +5,139 @@ Simulates real vehicle detection and dynamic timing adjustments
 
 import asyncio
 import aiohttp
+import json
 import logging
+import numpy as np
+import sys
+from logging.handlers import MemoryHandler
 from datetime import datetime
+from typing import Optional
 import time
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+# Buffer records and write them out in batches instead of one write() per
+# line; warnings/errors flush immediately, and the buffer is flushed whenever
+# the simulator goes idle between cycles (or, in continuous mode, once a
+# cycle's update has been sent) so output still appears promptly.
+_log_buffer = MemoryHandler(
+    capacity=256, flushLevel=logging.WARNING, target=_console_handler)
+
+logging.basicConfig(level=logging.INFO, handlers=[_log_buffer])
 logger = logging.getLogger('DynamicTimingTest')
 
+# orjson encodes straight to bytes and is several times faster than the
+# stdlib encoder; it is optional, so fall back to json when missing.
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# uvloop is a faster drop-in event loop (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# API endpoints (joined onto the session's base_url)
+VEHICLE_COUNTS_PATH = '/api/signals/vehicle-counts'
+TIMING_STATUS_PATH = '/api/signals/dynamic-timing/status'
+TIMING_STATS_PATH = '/api/signals/dynamic-timing/stats'
+
+LANES = ('north', 'south', 'east', 'west')
+
+# Continuous mode: seconds between updates, and how many generated updates
+# may wait for the sender before generation pauses
+CONTINUOUS_INTERVAL = 5.0
+CONTINUOUS_QUEUE_SIZE = 4
+
+# Display labels for log output, built once
+LANE_LABELS = {lane: lane.upper() for lane in LANES}
+
+# Scenario 4: gradual build-up, per-lane counts (north, south, east, west)
+_SCENARIO4_PATTERN = (
+    (1, 1, 1, 1),
+    (3, 2, 4, 3),
+    (7, 8, 6, 9),
+    (15, 12, 18, 16),
+    (22, 25, 20, 24),
+)
+_SCENARIO4_LABELS = ('Empty', 'Light', 'Moderate', 'Heavy', 'Critical')
+
+
+def _lane_label(lane: str) -> str:
+    """Upper-case display label for a lane name."""
+    label = LANE_LABELS.get(lane)
+    return label if label is not None else str(lane).upper()
+
 
 class DynamicTimingSimulator:
     """Simulates vehicle detection and sends to dynamic timing API."""
 
-    def __init__(self, base_url='http://localhost:8765'):
+    def __init__(self, base_url='http://localhost:8765', seed: Optional[int] = None):
         self.base_url = base_url
         self.running = False
-
-    async def send_vehicle_count(self, session, lane: str, count: int):
-        """Send vehicle count to server."""
-        url = f"{self.base_url}/api/signals/vehicle-count"
-        payload = {
-            'lane': lane,
-            'count': count
-        }
+        # Pass a seed to replay the same continuous-mode traffic
+        self._rng = np.random.default_rng(seed)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        """Open the HTTP session shared by every request of the simulator."""
+        # Keep connections (and resolved DNS) alive for the simulator's whole
+        # lifetime so each request reuses an open socket instead of reconnecting.
+        connector = aiohttp.TCPConnector(
+            limit=32, limit_per_host=16, ttl_dns_cache=300,
+            keepalive_timeout=60, enable_cleanup_closed=True)
+        self._session = aiohttp.ClientSession(
+            base_url=self.base_url, connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the HTTP session."""
+        await self._session.close()
+        self._session = None
+
+    async def _idle(self, seconds: float):
+        """Flush buffered log output, then wait before the next cycle."""
+        _log_buffer.flush()
+        await asyncio.sleep(seconds)
+
+    async def send_vehicle_counts(self, counts: dict):
+        """Send vehicle counts for all lanes to server in one request."""
+        payload = {'counts': counts}
 
         try:
-            async with session.post(url, json=payload) as response:
+            async with self._session.post(
+                    VEHICLE_COUNTS_PATH, data=_json_dumps(payload),
+                    headers=JSON_HEADERS) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     if 'timing' in data:
-                        timing = data['timing']
-                        logger.info(
-                            f"✅ {lane.upper()}: {count} vehicles → "
-                            f"GREEN: {timing['green_duration']}s "
-                            f"({timing['congestion_level']}) - {timing['reason']}"
-                        )
+                        if logger.isEnabledFor(logging.INFO):
+                            timing = data['timing']
+                            logger.info(
+                                "✅ %s: %s vehicles → GREEN: %ss (%s)",
+                                _lane_label(data['selected_lane']),
+                                data['vehicle_count'],
+                                timing['green_duration'],
+                                timing['congestion_level'])
                     else:
-                        logger.warning(f"No timing in response: {data}")
+                        logger.warning("No timing in response: %s", data)
                 else:
-                    logger.error(f"Error: {response.status}")
+                    logger.error("Error: %s", response.status)
         except Exception as e:
-            logger.error(f"Failed to send vehicle count: {e}")
+            logger.error("Failed to send vehicle counts: %s", e)
 
-    async def simulate_scenario_1_light_traffic(self, session):
+    async def simulate_scenario_1_light_traffic(self):
         """Scenario 1: Light traffic on all lanes."""
         logger.info("\n" + "="*70)
         logger.info("🚗 SCENARIO 1: Light Traffic (Few vehicles)")
@@ -58,13 +146,11 @@ class DynamicTimingSimulator:
         # Light traffic: 2-4 vehicles per lane
         for i in range(5):
             logger.info(f"\n--- Cycle {i+1} ---")
-            await self.send_vehicle_count(session, 'north', 2)
-            await self.send_vehicle_count(session, 'south', 3)
-            await self.send_vehicle_count(session, 'east', 2)
-            await self.send_vehicle_count(session, 'west', 4)
-            await asyncio.sleep(3)
+            await self.send_vehicle_counts(
+                {'north': 2, 'south': 3, 'east': 2, 'west': 4})
+            await self._idle(3)
 
-    async def simulate_scenario_2_heavy_traffic(self, session):
+    async def simulate_scenario_2_heavy_traffic(self):
         """Scenario 2: Heavy traffic on specific lanes."""
         logger.info("\n" + "="*70)
         logger.info("🚗🚗🚗 SCENARIO 2: Heavy Traffic (Rush Hour)")
@@ -79,11 +165,10 @@ class DynamicTimingSimulator:
 
         for cycle, scenario in enumerate(scenarios):
             logger.info(f"\n--- Cycle {cycle+1} ---")
-            for lane, count in scenario.items():
-                await self.send_vehicle_count(session, lane, count)
-            await asyncio.sleep(3)
+            await self.send_vehicle_counts(scenario)
+            await self._idle(3)
 
-    async def simulate_scenario_3_ambulance_with_traffic(self, session):
+    async def simulate_scenario_3_ambulance_with_traffic(self):
         """Scenario 3: Ambulance approach (needs full timing)."""
         logger.info("\n" + "="*70)
         logger.info("🚑 SCENARIO 3: Ambulance Incoming + Traffic")
@@ -91,74 +176,72 @@ class DynamicTimingSimulator:
 
         # Before ambulance
         logger.info("\nBefore Ambulance:")
-        for lane, count in {'north': 10, 'south': 5, 'east': 8, 'west': 12}.items():
-            await self.send_vehicle_count(session, lane, count)
-        await asyncio.sleep(2)
+        await self.send_vehicle_counts(
+            {'north': 10, 'south': 5, 'east': 8, 'west': 12})
+        await self._idle(2)
 
         # Ambulance triggered (would be separate API call)
         logger.info("\n🚑 Ambulance triggered on WEST lane!")
-        await asyncio.sleep(2)
+        await self._idle(2)
 
         # During ambulance (still receiving vehicle counts)
         logger.info("\nDuring Ambulance:")
-        for lane, count in {'north': 8, 'south': 3, 'east': 6, 'west': 20}.items():
-            await self.send_vehicle_count(session, lane, count)
-        await asyncio.sleep(2)
+        await self.send_vehicle_counts(
+            {'north': 8, 'south': 3, 'east': 6, 'west': 20})
+        await self._idle(2)
 
-    async def simulate_scenario_4_congestion_increase(self, session):
+    async def simulate_scenario_4_congestion_increase(self):
         """Scenario 4: Gradual congestion increase (realistic)."""
         logger.info("\n" + "="*70)
         logger.info("📈 SCENARIO 4: Gradual Traffic Build-up")
         logger.info("="*70)
 
         # Gradually increase traffic
-        congestion_levels = [
-            (1, 1, 1, 1),   # Empty
-            (3, 2, 4, 3),   # Light
-            (7, 8, 6, 9),   # Moderate
-            (15, 12, 18, 16),  # Heavy
-            (22, 25, 20, 24),  # Very heavy
-        ]
+        for cycle, (counts, label) in enumerate(
+                zip(_SCENARIO4_PATTERN, _SCENARIO4_LABELS), start=1):
+            logger.info("\n--- Cycle %d (%s) ---", cycle, label)
+            await self.send_vehicle_counts(dict(zip(LANES, counts)))
+            await self._idle(2)
 
-        for cycle, (n, s, e, w) in enumerate(congestion_levels):
-            logger.info(
-                f"\n--- Cycle {cycle+1} ({['Empty', 'Light', 'Moderate', 'Heavy', 'Critical'][cycle]}) ---")
-            await self.send_vehicle_count(session, 'north', n)
-            await self.send_vehicle_count(session, 'south', s)
-            await self.send_vehicle_count(session, 'east', e)
-            await self.send_vehicle_count(session, 'west', w)
-            await asyncio.sleep(2)
-
-    async def get_timing_status(self, session):
+    async def get_timing_status(self):
         """Get current timing status."""
-        url = f"{self.base_url}/api/signals/dynamic-timing/status"
         try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info("\n" + "="*70)
-                    logger.info("📊 DYNAMIC TIMING STATUS")
-                    logger.info("="*70)
-                    logger.info(f"Timestamp: {data['timestamp']}")
-                    logger.info(f"Current Phase: {data['signal_phase']}")
-                    logger.info(f"Vehicle Counts: {data['vehicle_counts']}")
-                    logger.info("\nCurrent Timings:")
-                    for lane, timing in data['timings'].items():
-                        if timing:
-                            logger.info(
-                                f"  {lane.upper()}: {timing['green']}s GREEN "
-                                f"({timing['congestion']})"
-                            )
+            async with self._session.get(TIMING_STATUS_PATH) as response:
+                if response.status != 200:
+                    return
+                data = _json_loads(await response.read())
+
+            # Polled every cycle in continuous mode; skip the report entirely
+            # when INFO output is suppressed
+            if not logger.isEnabledFor(logging.INFO):
+                return
+
+            logger.info("\n" + "="*70)
+            logger.info("📊 DYNAMIC TIMING STATUS")
+            logger.info("="*70)
+            if not data.get('selected_lane'):
+                logger.info("No lane selected")
+                return
+
+            logger.info("Timestamp: %s", data['timestamp'])
+            logger.info("Selected Lane: %s", _lane_label(data['selected_lane']))
+            logger.info("Vehicle Count: %s", data['vehicle_count'])
+            timing = data.get('timing')
+            if timing:
+                logger.info("Current Timing: %ss GREEN (%s)",
+                            timing['green'], timing['congestion'])
+            logger.info("\nPhase Timings:")
+            for phase, green in data['phase_timings'].items():
+                logger.info("  %s: %ss", phase, green)
         except Exception as e:
-            logger.error(f"Failed to get status: {e}")
+            logger.error("Failed to get status: %s", e)
 
-    async def get_timing_stats(self, session):
+    async def get_timing_stats(self):
         """Get detailed statistics."""
-        url = f"{self.base_url}/api/signals/dynamic-timing/stats"
         try:
-            async with session.get(url) as response:
+            async with self._session.get(TIMING_STATS_PATH) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     logger.info("\n" + "="*70)
                     logger.info("📈 DYNAMIC TIMING STATISTICS")
                     logger.info("="*70)
@@ -166,7 +249,7 @@ class DynamicTimingSimulator:
                         f"Total Updates: {data['total_timing_updates']}")
                     logger.info("\nPer-Lane Statistics:")
                     for lane, stats in data['lanes'].items():
-                        logger.info(f"\n  {lane.upper()}:")
+                        logger.info("\n  %s:", _lane_label(lane))
                         logger.info(
                             f"    Average Vehicles: {stats['average_vehicle_count']:.1f}")
                         logger.info(
@@ -181,79 +264,110 @@ class DynamicTimingSimulator:
 
     async def run_all_scenarios(self):
         """Run all test scenarios."""
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Scenario 1
-                await self.simulate_scenario_1_light_traffic(session)
-                await asyncio.sleep(2)
+        try:
+            # Scenario 1
+            await self.simulate_scenario_1_light_traffic()
+            await self._idle(2)
 
-                # Scenario 2
-                await self.simulate_scenario_2_heavy_traffic(session)
-                await asyncio.sleep(2)
+            # Scenario 2
+            await self.simulate_scenario_2_heavy_traffic()
+            await self._idle(2)
 
-                # Scenario 3
-                await self.simulate_scenario_3_ambulance_with_traffic(session)
-                await asyncio.sleep(2)
+            # Scenario 3
+            await self.simulate_scenario_3_ambulance_with_traffic()
+            await self._idle(2)
 
-                # Scenario 4
-                await self.simulate_scenario_4_congestion_increase(session)
-                await asyncio.sleep(2)
+            # Scenario 4
+            await self.simulate_scenario_4_congestion_increase()
+            await self._idle(2)
 
-                # Get final status
-                await self.get_timing_status(session)
-                await self.get_timing_stats(session)
+            # Get final status
+            await self.get_timing_status()
+            await self.get_timing_stats()
 
-            except Exception as e:
-                logger.error(f"Error running scenarios: {e}")
+        except Exception as e:
+            logger.error(f"Error running scenarios: {e}")
 
     async def run_continuous(self):
         """Run continuous simulation (useful for live testing)."""
-        async with aiohttp.ClientSession() as session:
-            logger.info(
-                "🔄 Starting continuous simulation (press Ctrl+C to stop)")
-
-            try:
-                cycle = 0
-                while True:
-                    cycle += 1
-                    logger.info(f"\n=== LIVE UPDATE CYCLE {cycle} ===")
+        logger.info(
+            "🔄 Starting continuous simulation (press Ctrl+C to stop)")
 
-                    # Simulate realistic vehicle counts
-                    import random
-                    base = random.randint(2, 15)
+        # The producer keeps the update cadence while HTTP round-trips run
+        # in the sender. There is deliberately one sender: the server smooths
+        # successive counts, so updates must arrive in order.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CONTINUOUS_QUEUE_SIZE)
+        producer = asyncio.create_task(self._produce_counts(queue))
+        sender = asyncio.create_task(self._send_queued_counts(queue))
 
-                    counts = {
-                        'north': base + random.randint(-2, 5),
-                        'south': base + random.randint(-2, 5),
-                        'east': base + random.randint(-2, 5),
-                        'west': base + random.randint(-2, 5),
-                    }
-
-                    for lane, count in counts.items():
-                        await self.send_vehicle_count(session, lane, max(0, count))
-
-                    await self.get_timing_status(session)
-                    await asyncio.sleep(5)  # Update every 5 seconds
-
-            except KeyboardInterrupt:
-                logger.info("\n⏹️  Continuous simulation stopped")
+        try:
+            await asyncio.gather(producer, sender)
+        except KeyboardInterrupt:
+            logger.info("\n⏹️  Continuous simulation stopped")
+        finally:
+            producer.cancel()
+            sender.cancel()
+
+    async def _produce_counts(self, queue: asyncio.Queue):
+        """Generate vehicle counts every CONTINUOUS_INTERVAL seconds."""
+        # Schedule cycles against absolute deadlines so request time
+        # doesn't accumulate as drift between updates
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        cycle = 0
+        while True:
+            cycle += 1
+
+            # Simulate realistic vehicle counts (one draw for all lanes)
+            base = int(self._rng.integers(2, 16))
+            offsets = self._rng.integers(-2, 6, size=len(LANES))
+
+            counts = {
+                lane: max(0, base + int(offset))
+                for lane, offset in zip(LANES, offsets)
+            }
+
+            await queue.put((cycle, counts))
+            next_tick += CONTINUOUS_INTERVAL
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    async def _send_queued_counts(self, queue: asyncio.Queue):
+        """Send generated counts to the server, in order."""
+        while True:
+            cycle, counts = await queue.get()
+            try:
+                logger.info("\n=== LIVE UPDATE CYCLE %d ===", cycle)
+                await self.send_vehicle_counts(counts)
+                await self.get_timing_status()
+            finally:
+                # Output for this cycle is complete; write it out now
+                _log_buffer.flush()
+                queue.task_done()
 
 
 async def main():
     """Main entry point."""
-    import sys
-
-    simulator = DynamicTimingSimulator()
-
-    if len(sys.argv) > 1 and sys.argv[1] == 'continuous':
-        await simulator.run_continuous()
-    else:
-        logger.info("🚀 Starting Dynamic Timing Integration Tests...")
-        logger.info("   This will simulate real vehicle detection and show")
-        logger.info("   how signal timings adjust automatically.\n")
-        await simulator.run_all_scenarios()
-        logger.info("\n✅ All scenarios completed!")
+    async with DynamicTimingSimulator() as simulator:
+        if len(sys.argv) > 1 and sys.argv[1] == 'continuous':
+            await simulator.run_continuous()
+        else:
+            logger.info("🚀 Starting Dynamic Timing Integration Tests...")
+            logger.info("   This will simulate real vehicle detection and show")
+            logger.info("   how signal timings adjust automatically.\n")
+            await simulator.run_all_scenarios()
+            logger.info("\n✅ All scenarios completed!")
+
+
+def run(coro):
+    """Run a coroutine on uvloop when it is installed."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    run(main())
@@ -0,0 +1,76 @@
+"""
+Multi-Zone Timing Kernel
+Numeric core of DynamicTimingCalculator (band lookup, smoothing, bounds)
+for many zones at once. Compiled with Numba when it is installed; the same
+function runs as plain Python otherwise.
+"""
+
+try:
+    from numba import njit
+    JIT_ENABLED = True
+except ImportError:
+    JIT_ENABLED = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def compute_greens(
+    counts,
+    prev_greens,
+    has_prev,
+    min_greens,
+    max_greens,
+    thresh_keys,
+    thresh_greens,
+    max_step,
+    bands,
+    greens
+):
+    """
+    Compute the green time for every zone
+
+    Mirrors DynamicTimingCalculator.calculate_timing for each zone i.
+
+    Args:
+        counts: Vehicle count per zone
+        prev_greens: Previous green time per zone (ignored where has_prev is False)
+        has_prev: Whether smoothing applies to the zone
+        min_greens: Minimum green per zone
+        max_greens: Maximum green per zone
+        thresh_keys: Sorted vehicle thresholds
+        thresh_greens: Suggested green for each threshold
+        max_step: Maximum change from the previous green
+        bands: Output, threshold index per zone (-1 below every threshold)
+        greens: Output, final green time per zone
+    """
+    n_thresh = len(thresh_keys)
+    for i in range(len(counts)):
+        count = counts[i]
+
+        # Highest threshold not above the count
+        lo = 0
+        hi = n_thresh
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if thresh_keys[mid] <= count:
+                lo = mid + 1
+            else:
+                hi = mid
+        band = lo - 1
+
+        if band >= 0:
+            green = thresh_greens[band]
+        else:
+            green = min_greens[i]
+
+        if has_prev[i]:
+            prev = prev_greens[i]
+            green = max(prev - max_step, min(prev + max_step, green))
+
+        bands[i] = band
+        greens[i] = max(min_greens[i], min(max_greens[i], green))
@@ -4,6 +4,8 @@ Integrates dynamic timing calculator with traffic signal state machine
 """
 
 import logging
+from collections import deque
+from itertools import islice
 from typing import Dict, Optional, Callable
 from datetime import datetime
 from .signal_state_machine import SignalStateMachine
@@ -47,6 +49,21 @@ class DynamicSignalController:
         >>> status = controller.get_status()
     """
 
+    # Fixed attribute layout: instantiated per signal and read on every tick
+    __slots__ = (
+        'signal_id',
+        'on_timing_change',
+        'timing_calculator',
+        'signal',
+        'current_vehicle_count',
+        'last_update_time',
+        'last_timing_update_time',
+        'timing_updates_count',
+        'status_version',
+        'timing_change_history',
+        '_status_template',
+    )
+
     def __init__(
         self,
         signal_id: str,
@@ -97,8 +114,23 @@ class DynamicSignalController:
         self.last_timing_update_time = None
         self.timing_updates_count = 0
 
+        # Bumped whenever anything reported by get_status() changes, other
+        # than the time-derived fields; lets callers reuse a status snapshot
+        self.status_version = 0
+
         # Timing change history
-        self.timing_change_history: list = []
+        self.timing_change_history: deque = deque(maxlen=100)
+
+        # Status dict refreshed in place by _refresh_status(); get_status()
+        # hands out copies. Key order matches the published status layout.
+        self._status_template: Dict = dict.fromkeys((
+            'signal_id', 'signal_state', 'is_running', 'time_remaining',
+            'green_duration', 'yellow_duration', 'red_duration',
+            'current_vehicle_count', 'timing_updates_count',
+            'calculator_stats', 'emergency_active', 'emergency_reason',
+            'last_timing_update', 'timestamp',
+        ))
+        self._status_template['signal_id'] = signal_id
 
         logger.info(f"DynamicSignalController initialized for {signal_id}")
 
@@ -111,6 +143,7 @@ class DynamicSignalController:
     def stop(self):
         """Stop the signal"""
         self.signal.stop()
+        self.status_version += 1
         logger.info(f"Dynamic signal {self.signal_id} stopped")
 
     def update_vehicle_count(self, vehicle_count: int) -> bool:
@@ -124,6 +157,7 @@ class DynamicSignalController:
             True if timing was updated, False otherwise
         """
         self.current_vehicle_count = vehicle_count
+        self.status_version += 1
 
         # Calculate new timing based on vehicle count
         new_timing = self.timing_calculator.calculate_timing(vehicle_count)
@@ -172,24 +206,22 @@ class DynamicSignalController:
         self.signal.yellow_duration = new_timing['yellow_duration']
         self.signal.red_duration = new_timing['red_duration']
 
-        self.last_timing_update_time = datetime.now()
+        now = datetime.now()
+        self.last_timing_update_time = now
         self.timing_updates_count += 1
 
         # Record change
         timing_record = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'old_green_duration': old_green,
             'new_green_duration': new_timing['green_duration'],
             'vehicle_count': new_timing['vehicle_count'],
             'congestion_level': new_timing['congestion_level'],
             'reason': new_timing['reason']
         }
+        # Bounded deque: only the last 100 changes are kept
         self.timing_change_history.append(timing_record)
 
-        # Keep only last 100 changes
-        if len(self.timing_change_history) > 100:
-            self.timing_change_history = self.timing_change_history[-100:]
-
         logger.info(
             f"Signal {self.signal_id} timing updated: "
             f"{old_green}s → {new_timing['green_duration']}s green "
@@ -209,11 +241,23 @@ class DynamicSignalController:
         Returns:
             Current signal status
         """
-        # Update signal state
-        self.signal.update()
-        self.last_update_time = datetime.now()
+        now = datetime.now()
+        self.update_with_clock(now)
+
+        return self.get_status(now)
 
-        return self.get_status()
+    def update_with_clock(self, now: datetime):
+        """
+        Update signal state against an externally supplied time
+
+        Unlike update(), no status dict is built; use this when driving
+        several signals from one clock read.
+
+        Args:
+            now: Current time
+        """
+        self.signal.update(now)
+        self.last_update_time = now
 
     def activate_emergency(self, reason: str = "Ambulance detected") -> bool:
         """
@@ -243,35 +287,46 @@ class DynamicSignalController:
             logger.info(f"Signal {self.signal_id} reset to normal operation")
         return success
 
-    def get_status(self) -> Dict:
+    def get_status(self, now: Optional[datetime] = None) -> Dict:
         """
         Get complete status including dynamic timing info
 
+        Args:
+            now: Timestamp to report (defaults to the current time)
+
         Returns:
             Dictionary with status information
         """
-        signal_info = self.signal.get_state_info()
-        calculator_stats = self.timing_calculator.get_statistics()
-
-        return {
-            'signal_id': self.signal_id,
-            'signal_state': signal_info['current_state'],
-            'is_running': signal_info['is_running'],
-            'time_remaining': signal_info['time_remaining'],
-            'green_duration': self.signal.green_duration,
-            'yellow_duration': self.signal.yellow_duration,
-            'red_duration': self.signal.red_duration,
-            'current_vehicle_count': self.current_vehicle_count,
-            'timing_updates_count': self.timing_updates_count,
-            'calculator_stats': calculator_stats,
-            'emergency_active': signal_info['emergency_active'],
-            'emergency_reason': signal_info['emergency_reason'],
-            'last_timing_update': (
-                self.last_timing_update_time.isoformat()
-                if self.last_timing_update_time else None
-            ),
-            'timestamp': datetime.now().isoformat()
-        }
+        if now is None:
+            now = datetime.now()
+        return self._refresh_status(now).copy()
+
+    def _refresh_status(self, now: datetime) -> Dict:
+        """Fill the shared status template in place and return it"""
+        signal = self.signal
+        status = self._status_template
+
+        # Read the state machine directly rather than through
+        # get_state_info(), which builds a dict and reads the clock again
+        status['signal_state'] = signal.current_state.value
+        status['is_running'] = signal.is_running
+        status['time_remaining'] = signal.time_remaining(now)
+        status['green_duration'] = signal.green_duration
+        status['yellow_duration'] = signal.yellow_duration
+        status['red_duration'] = signal.red_duration
+        status['current_vehicle_count'] = self.current_vehicle_count
+        status['timing_updates_count'] = self.timing_updates_count
+        status['calculator_stats'] = self.timing_calculator.get_statistics()
+        status['emergency_active'] = signal.emergency_active
+        status['emergency_reason'] = (
+            signal.emergency_reason if signal.emergency_active else ""
+        )
+        status['last_timing_update'] = (
+            self.last_timing_update_time.isoformat()
+            if self.last_timing_update_time else None
+        )
+        status['timestamp'] = now.isoformat()
+        return status
 
     def get_timing_change_history(self, limit: int = 20) -> list:
         """
@@ -283,10 +338,12 @@ class DynamicSignalController:
         Returns:
             List of timing change records
         """
-        return self.timing_change_history[-limit:]
+        history = self.timing_change_history
+        return list(islice(history, max(0, len(history) - limit), None))
 
     def _on_signal_state_change(self, signal_id: str, new_state):
         """Callback when signal state changes"""
+        self.status_version += 1
         logger.debug(f"Signal {signal_id} state changed to {new_state.value}")
 
     def __str__(self) -> str:
@@ -324,9 +381,17 @@ class MultiDynamicSignalController:
         >>> status = controller.get_all_signals_status()
     """
 
+    __slots__ = ('signals', '_status_cache', '_status_versions')
+
     def __init__(self):
         """Initialize multi-signal controller"""
         self.signals: Dict[str, DynamicSignalController] = {}
+
+        # Status view served by get_all_signals_status(): one entry per
+        # registered signal (the controller's status template), plus the
+        # controller's status_version it was last fully refreshed at
+        self._status_cache: Dict[str, Dict] = {}
+        self._status_versions: Dict[str, int] = {}
         logger.info("MultiDynamicSignalController initialized")
 
     def register_signal(
@@ -357,6 +422,8 @@ class MultiDynamicSignalController:
             max_green=max_green
         )
         self.signals[signal_id] = controller
+        self._status_cache[signal_id] = controller._status_template
+        self._status_versions[signal_id] = -1  # refresh on first read
         logger.info(f"Dynamic signal registered: {signal_id} ({direction})")
         return controller
 
@@ -391,8 +458,11 @@ class MultiDynamicSignalController:
 
     def update(self):
         """Update all signals"""
+        # One clock read per tick, shared by every signal; the per-signal
+        # status dicts that update() builds are not needed here
+        now = datetime.now()
         for signal in self.signals.values():
-            signal.update()
+            signal.update_with_clock(now)
 
     def get_signal_status(self, signal_id: str) -> Optional[Dict]:
         """Get status of specific signal"""
@@ -401,11 +471,27 @@ class MultiDynamicSignalController:
         return self.signals[signal_id].get_status()
 
     def get_all_signals_status(self) -> Dict[str, Dict]:
-        """Get status of all signals"""
-        return {
-            signal_id: signal.get_status()
-            for signal_id, signal in self.signals.items()
-        }
+        """
+        Get status of all signals
+
+        The returned mapping is reused between calls and refreshed in place;
+        treat it as read-only.
+        """
+        now = datetime.now()
+        now_iso = now.isoformat()
+        cache = self._status_cache
+        versions = self._status_versions
+        for signal_id, signal in self.signals.items():
+            version = signal.status_version
+            if versions[signal_id] != version:
+                signal._refresh_status(now)
+                versions[signal_id] = version
+            else:
+                # Only the time-derived fields move between versions
+                status = cache[signal_id]
+                status['time_remaining'] = signal.signal.time_remaining(now)
+                status['timestamp'] = now_iso
+        return cache
 
     def activate_emergency(self, signal_id: str, reason: str = "Ambulance detected") -> bool:
         """Activate emergency for specific signal"""
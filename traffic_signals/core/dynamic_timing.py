@@ -4,26 +4,76 @@ Adjusts signal timing based on real-time vehicle congestion levels
 """
 
 import logging
-from typing import Dict, Optional, Tuple
+import time
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 from datetime import datetime, timedelta
 
+try:
+    import numpy as np
+except ImportError:  # batch timing falls back to per-zone calculation
+    np = None
+
 logger = logging.getLogger(__name__)
 
 
-class CongestionLevel(Enum):
-    """Traffic congestion levels"""
-    NONE = "NONE"           # No vehicles
-    LOW = "LOW"             # Few vehicles
-    MODERATE = "MODERATE"   # Normal traffic
-    HIGH = "HIGH"           # Heavy traffic
-    CRITICAL = "CRITICAL"   # Very heavy traffic
+class CongestionLevel(IntEnum):
+    """
+    Traffic congestion levels, ordered by severity
+
+    Members are ints so they can index lookup tables directly; the level's
+    display string (as reported in timing results) is its name.
+    """
+    NONE = 0        # No vehicles
+    LOW = 1         # Few vehicles
+    MODERATE = 2    # Normal traffic
+    HIGH = 3        # Heavy traffic
+    CRITICAL = 4    # Very heavy traffic
+
+
+def _threshold_tables(thresholds: Dict) -> Tuple[Tuple, Tuple, Tuple]:
+    """VEHICLE_THRESHOLDS as parallel (keys, levels, greens) tuples sorted by threshold"""
+    keys, bands = zip(*sorted(thresholds.items()))
+    levels, greens = zip(*bands)
+    return keys, levels, greens
+
+
+def _result_templates(reasons: Dict) -> Tuple[Dict, ...]:
+    """
+    Result dict skeleton per level, indexed by level: static strings filled
+    in, numeric fields set per call (key order is the published result layout)
+    """
+    return tuple(
+        {
+            'green_duration': None,
+            'yellow_duration': None,
+            'red_duration': None,
+            'vehicle_count': None,
+            'congestion_level': level.name,
+            'reason': reason,
+        }
+        for level, reason in sorted(reasons.items())
+    )
 
 
 @dataclass
 class TimingConfig:
     """Signal timing configuration"""
+    # Declared by hand rather than dataclass(slots=True), which needs 3.10+
+    __slots__ = (
+        'green_duration',
+        'yellow_duration',
+        'red_duration',
+        'congestion_level',
+        'vehicle_count',
+        'timestamp',
+    )
+
     green_duration: int
     yellow_duration: int
     red_duration: int
@@ -64,7 +114,9 @@ class DynamicTimingCalculator:
         }
     """
 
-    # Congestion thresholds for single zone
+    # Congestion thresholds for single zone. Subclasses may override these,
+    # REASON_MESSAGES and MAX_GREEN_STEP; the lookup tables derived from them
+    # are rebuilt per class (see __init_subclass__).
     VEHICLE_THRESHOLDS = {
         0: (CongestionLevel.NONE, 15),           # 0 vehicles: 15s green
         1: (CongestionLevel.LOW, 20),            # 1-5 vehicles: 20s green
@@ -83,6 +135,22 @@ class DynamicTimingCalculator:
         CongestionLevel.CRITICAL: "🔴🔴 Very heavy traffic - maximum green",
     }
 
+    # Maximum change in green time per update when smoothing (seconds)
+    MAX_GREEN_STEP = 5
+
+    # Lookup tables derived from the above: result skeletons per level, and
+    # the thresholds as sorted parallel tuples for bisect
+    _RESULT_TEMPLATES = _result_templates(REASON_MESSAGES)
+    _THRESH_KEYS, _THRESH_LEVELS, _THRESH_GREEN = _threshold_tables(
+        VEHICLE_THRESHOLDS)
+
+    def __init_subclass__(cls, **kwargs):
+        """Rebuild the lookup tables from the subclass's thresholds and messages"""
+        super().__init_subclass__(**kwargs)
+        cls._RESULT_TEMPLATES = _result_templates(cls.REASON_MESSAGES)
+        cls._THRESH_KEYS, cls._THRESH_LEVELS, cls._THRESH_GREEN = (
+            _threshold_tables(cls.VEHICLE_THRESHOLDS))
+
     def __init__(
         self,
         base_cycle_time: int = 90,
@@ -110,15 +178,31 @@ class DynamicTimingCalculator:
         self.smoothing_enabled = smoothing_enabled
         self.smoothing_window = smoothing_window
 
-        # Smoothing buffer to prevent rapid changes
-        self.timing_history: list = []
-        self.vehicle_count_history: list = []
-        self.last_calculated_timing: Optional[TimingConfig] = None
+        # Cycle time left for green + red once yellow is taken out
+        self._red_base = base_cycle_time - yellow_duration
+
+        # Smoothing buffer to prevent rapid changes (bounded windows)
+        self.timing_history: deque = deque(maxlen=smoothing_window * 2)
+        self.vehicle_count_history: deque = deque(maxlen=smoothing_window * 2)
+        # Fields of the last calculation; the TimingConfig is only built
+        # when last_calculated_timing is read
+        self._last_timing_fields: Optional[Tuple] = None
+        self._last_timing_config: Optional[TimingConfig] = None
+        # Shared calculation time while inside batch_mode()
+        self._batch_time: Optional[float] = None
+
+        # Running aggregates over the history windows, maintained as samples
+        # enter and leave so get_statistics() doesn't rescan the windows.
+        # Min/max use monotonic deques of (sequence number, green).
+        self._count_sum = 0
+        self._green_sum = 0
+        self._green_seq = 0
+        self._green_min: deque = deque()
+        self._green_max: deque = deque()
 
         logger.info(
-            f"DynamicTimingCalculator initialized: "
-            f"cycle_time={base_cycle_time}s, "
-            f"green={min_green}-{max_green}s"
+            "DynamicTimingCalculator initialized: cycle_time=%ss, green=%s-%ss",
+            base_cycle_time, min_green, max_green
         )
 
     def calculate_timing(self, vehicle_count: int) -> Dict:
@@ -139,113 +223,112 @@ class DynamicTimingCalculator:
                 'reason': '🟠 Moderate traffic - normal green'
             }
         """
-        # Determine congestion level and base green time
-        congestion_level, suggested_green = self._get_congestion_level_and_timing(
-            vehicle_count
-        )
-
-        # Apply smoothing if enabled
-        if self.smoothing_enabled:
-            final_green = self._apply_smoothing(suggested_green, vehicle_count)
-        else:
-            final_green = suggested_green
+        # Smoothing works from the previous green, if there is one
+        history = self.timing_history
+        prev_green = history[-1] if history and self.smoothing_enabled else None
 
-        # Ensure within bounds
-        final_green = max(self.min_green, min(self.max_green, final_green))
-
-        # Calculate red duration (remaining cycle time)
-        red_duration = self.base_cycle_time - final_green - self.yellow_duration
-
-        # Create timing config
-        timing_config = TimingConfig(
-            green_duration=final_green,
-            yellow_duration=self.yellow_duration,
-            red_duration=max(10, red_duration),  # Ensure minimum red time
-            congestion_level=congestion_level,
-            vehicle_count=vehicle_count,
-            timestamp=datetime.now()
+        # Band lookup, smoothing and bounds (memoized, see _compute_timing)
+        final_green, congestion_level = _compute_timing(
+            type(self), vehicle_count, prev_green, self.min_green, self.max_green
         )
 
-        # Update history for smoothing
-        self.timing_history.append(final_green)
-        if len(self.timing_history) > self.smoothing_window * 2:
-            self.timing_history = self.timing_history[-self.smoothing_window * 2:]
-
-        self.vehicle_count_history.append(vehicle_count)
-        if len(self.vehicle_count_history) > self.smoothing_window * 2:
-            self.vehicle_count_history = self.vehicle_count_history[-self.smoothing_window * 2:]
-
-        # Store last calculated timing
-        self.last_calculated_timing = timing_config
-
-        return {
-            'green_duration': timing_config.green_duration,
-            'yellow_duration': timing_config.yellow_duration,
-            'red_duration': timing_config.red_duration,
-            'vehicle_count': timing_config.vehicle_count,
-            'congestion_level': timing_config.congestion_level.value,
-            'reason': self.REASON_MESSAGES[congestion_level]
-        }
+        return self._record_timing(final_green, congestion_level, vehicle_count)
 
-    def _get_congestion_level_and_timing(
+    def _record_timing(
         self,
-        vehicle_count: int
-    ) -> Tuple[CongestionLevel, int]:
-        """
-        Determine congestion level and suggested green time
-
-        Args:
-            vehicle_count: Number of vehicles
-
-        Returns:
-            Tuple of (CongestionLevel, suggested_green_time)
-        """
-        # Find the appropriate threshold
-        congestion_level = CongestionLevel.NONE
-        suggested_green = self.min_green
-
-        for threshold, (level, green_time) in sorted(
-            self.VEHICLE_THRESHOLDS.items(),
-            reverse=True
-        ):
-            if vehicle_count >= threshold:
-                congestion_level = level
-                suggested_green = green_time
-                break
-
-        return congestion_level, suggested_green
-
-    def _apply_smoothing(self, suggested_green: int, vehicle_count: int) -> int:
+        final_green: int,
+        congestion_level: CongestionLevel,
+        vehicle_count: int,
+        calculated_at: Optional[float] = None
+    ) -> Dict:
         """
-        Apply smoothing to prevent rapid timing changes
+        Record a calculated green time and build the timing result
 
         Args:
-            suggested_green: Newly calculated green time
-            vehicle_count: Current vehicle count
+            final_green: Smoothed, bounded green time
+            congestion_level: Congestion level for the count
+            vehicle_count: Number of vehicles in zone
+            calculated_at: Calculation time as an epoch timestamp (defaults
+                to the batch_mode() time, or the current time)
 
         Returns:
-            Smoothed green time
+            Timing configuration dictionary (see calculate_timing)
         """
-        if not self.timing_history:
-            return suggested_green
-
-        # Get previous green time
-        prev_green = self.timing_history[-1]
-
-        # Maximum change allowed per update (seconds)
-        max_change_per_step = 5
+        # Calculate red duration (remaining cycle time)
+        red_duration = max(10, self._red_base - final_green)  # Ensure minimum red time
 
-        # Don't jump too much from previous value
-        if abs(suggested_green - prev_green) > max_change_per_step:
-            # Gradually increase or decrease
-            if suggested_green > prev_green:
-                smoothed_green = prev_green + max_change_per_step
-            else:
-                smoothed_green = prev_green - max_change_per_step
-        else:
-            smoothed_green = suggested_green
+        # Update history for smoothing
+        self._push_history(final_green, vehicle_count)
 
-        return smoothed_green
+        # Store last calculated timing
+        if calculated_at is None:
+            calculated_at = self._batch_time
+            if calculated_at is None:
+                calculated_at = time.time()
+        self._last_timing_fields = (
+            final_green, red_duration, congestion_level, vehicle_count, calculated_at
+        )
+        self._last_timing_config = None
+
+        result = self._RESULT_TEMPLATES[congestion_level].copy()
+        result['green_duration'] = final_green
+        result['yellow_duration'] = self.yellow_duration
+        result['red_duration'] = red_duration
+        result['vehicle_count'] = vehicle_count
+        return result
+
+    @property
+    def last_calculated_timing(self) -> Optional[TimingConfig]:
+        """Last calculated timing, or None before the first calculation"""
+        if self._last_timing_config is None and self._last_timing_fields:
+            green, red, level, count, calculated_at = self._last_timing_fields
+            self._last_timing_config = TimingConfig(
+                green_duration=green,
+                yellow_duration=self.yellow_duration,
+                red_duration=red,
+                congestion_level=level,
+                vehicle_count=count,
+                timestamp=datetime.fromtimestamp(calculated_at)
+            )
+        return self._last_timing_config
+
+    def _push_history(self, green: int, vehicle_count: int):
+        """Append to the history windows and update the running aggregates"""
+        timing_history = self.timing_history
+        count_history = self.vehicle_count_history
+        if not timing_history.maxlen:
+            return  # Zero-length window keeps nothing
+
+        # Account for the samples the append is about to evict
+        if len(timing_history) == timing_history.maxlen:
+            self._green_sum -= timing_history[0]
+        if len(count_history) == count_history.maxlen:
+            self._count_sum -= count_history[0]
+
+        timing_history.append(green)
+        count_history.append(vehicle_count)
+        self._green_sum += green
+        self._count_sum += vehicle_count
+
+        # Sliding-window min/max: drop entries the new green dominates, then
+        # entries that have left the window
+        seq = self._green_seq
+        self._green_seq = seq + 1
+        oldest = self._green_seq - len(timing_history)
+
+        green_min = self._green_min
+        while green_min and green_min[-1][1] >= green:
+            green_min.pop()
+        green_min.append((seq, green))
+        if green_min[0][0] < oldest:
+            green_min.popleft()
+
+        green_max = self._green_max
+        while green_max and green_max[-1][1] <= green:
+            green_max.pop()
+        green_max.append((seq, green))
+        if green_max[0][0] < oldest:
+            green_max.popleft()
 
     def get_statistics(self) -> Dict:
         """
@@ -254,29 +337,53 @@ class DynamicTimingCalculator:
         Returns:
             Statistics dictionary
         """
-        avg_vehicle_count = (
-            sum(self.vehicle_count_history) / len(self.vehicle_count_history)
-            if self.vehicle_count_history else 0
-        )
+        samples = len(self.vehicle_count_history)
+        adjustments = len(self.timing_history)
+
+        avg_vehicle_count = self._count_sum / samples if samples else 0
         avg_green_time = (
-            sum(self.timing_history) / len(self.timing_history)
-            if self.timing_history else self.min_green
+            self._green_sum / adjustments if adjustments else self.min_green
         )
 
         return {
             'average_vehicle_count': round(avg_vehicle_count, 2),
             'average_green_duration': round(avg_green_time, 2),
-            'min_green_observed': min(self.timing_history) if self.timing_history else self.min_green,
-            'max_green_observed': max(self.timing_history) if self.timing_history else self.max_green,
-            'total_adjustments': len(self.timing_history),
-            'history_samples': len(self.vehicle_count_history)
+            'min_green_observed': self._green_min[0][1] if adjustments else self.min_green,
+            'max_green_observed': self._green_max[0][1] if adjustments else self.max_green,
+            'total_adjustments': adjustments,
+            'history_samples': samples
         }
 
+    @contextmanager
+    def batch_mode(self):
+        """
+        Share one calculation timestamp across a block of calculations
+
+        Useful when replaying recorded counts, where reading the clock for
+        every sample is wasted work.
+
+        Example:
+            >>> with calculator.batch_mode():
+            ...     for count in recorded_counts:
+            ...         calculator.calculate_timing(count)
+        """
+        previous = self._batch_time
+        self._batch_time = time.time()
+        try:
+            yield self
+        finally:
+            self._batch_time = previous
+
     def reset_history(self):
         """Reset timing history and statistics"""
         self.timing_history.clear()
         self.vehicle_count_history.clear()
-        self.last_calculated_timing = None
+        self._count_sum = 0
+        self._green_sum = 0
+        self._green_min.clear()
+        self._green_max.clear()
+        self._last_timing_fields = None
+        self._last_timing_config = None
         logger.info("DynamicTimingCalculator history reset")
 
     def __repr__(self) -> str:
@@ -289,6 +396,48 @@ class DynamicTimingCalculator:
         )
 
 
+@lru_cache(maxsize=1024)
+def _compute_timing(
+    calculator_cls: type,
+    vehicle_count: int,
+    prev_green: Optional[int],
+    min_green: int,
+    max_green: int
+) -> Tuple[int, CongestionLevel]:
+    """
+    Final green time and congestion level for a vehicle count
+
+    Pure function of its arguments, so results are memoized: under steady
+    traffic the same (count, previous green) pairs repeat frame after frame.
+
+    Args:
+        calculator_cls: Calculator class providing thresholds and smoothing step
+        vehicle_count: Number of vehicles
+        prev_green: Previous green time, or None when not smoothing
+        min_green: Minimum green duration
+        max_green: Maximum green duration
+
+    Returns:
+        Tuple of (green_time, CongestionLevel)
+    """
+    # Highest threshold not above the count
+    idx = bisect_right(calculator_cls._THRESH_KEYS, vehicle_count) - 1
+    if idx < 0:
+        # Below every threshold (negative count)
+        congestion_level, green = CongestionLevel.NONE, min_green
+    else:
+        congestion_level = calculator_cls._THRESH_LEVELS[idx]
+        green = calculator_cls._THRESH_GREEN[idx]
+
+    # Move towards the suggestion by at most MAX_GREEN_STEP seconds
+    if prev_green is not None:
+        step = calculator_cls.MAX_GREEN_STEP
+        green = max(prev_green - step, min(prev_green + step, green))
+
+    # Ensure within bounds
+    return max(min_green, min(max_green, green)), congestion_level
+
+
 class MultiZoneDynamicTiming:
     """
     Advanced: Manage dynamic timing for multiple zones/lanes
@@ -299,6 +448,7 @@ class MultiZoneDynamicTiming:
     def __init__(self):
         """Initialize multi-zone timing manager"""
         self.zones: Dict[str, DynamicTimingCalculator] = {}
+
         logger.info("MultiZoneDynamicTiming initialized")
 
     def add_zone(
@@ -326,7 +476,8 @@ class MultiZoneDynamicTiming:
             max_green=max_green
         )
         self.zones[zone_id] = calculator
-        logger.info(f"Zone {zone_id} added to dynamic timing manager")
+
+        logger.info("Zone %s added to dynamic timing manager", zone_id)
         return calculator
 
     def calculate_timing_for_zone(self, zone_id: str, vehicle_count: int) -> Optional[Dict]:
@@ -341,14 +492,160 @@ class MultiZoneDynamicTiming:
             Timing configuration or None if zone not found
         """
         if zone_id not in self.zones:
-            logger.warning(f"Zone {zone_id} not found")
+            logger.warning("Zone %s not found", zone_id)
             return None
 
         return self.zones[zone_id].calculate_timing(vehicle_count)
 
+    def calculate_timing_batch(self, zone_counts: Dict[str, int]) -> Dict[str, Dict]:
+        """
+        Calculate timing for several zones at once
+
+        Band lookup, smoothing and bounds are evaluated for all zones in one
+        pass: a Numba-compiled kernel when Numba is installed, vectorized
+        NumPy otherwise, or the kernel as plain Python without NumPy. Results
+        and per-zone history are identical to calling
+        calculate_timing_for_zone for each zone. Zones whose calculator is a
+        subclass (which may define its own thresholds) are calculated one by
+        one.
+
+        Args:
+            zone_counts: Vehicle count per zone identifier
+
+        Returns:
+            Timing configuration per zone (unknown zones are skipped)
+        """
+        zone_ids = []
+        other_ids = []
+        for zone_id in zone_counts:
+            calculator = self.zones.get(zone_id)
+            if calculator is None:
+                logger.warning("Zone %s not found", zone_id)
+            elif type(calculator) is DynamicTimingCalculator:
+                zone_ids.append(zone_id)
+            else:
+                other_ids.append(zone_id)
+
+        results = self._calculate_batch_rows(zone_ids, zone_counts)
+        if other_ids:
+            for zone_id in other_ids:
+                results[zone_id] = self.zones[zone_id].calculate_timing(
+                    zone_counts[zone_id])
+            # Report zones in request order
+            results = {
+                zone_id: results[zone_id]
+                for zone_id in zone_counts if zone_id in results
+            }
+        return results
+
+    def _calculate_batch_rows(
+        self,
+        zone_ids: List[str],
+        zone_counts: Dict[str, int]
+    ) -> Dict[str, Dict]:
+        """Batch-calculate zones whose calculators use the base thresholds"""
+        if not zone_ids:
+            return {}
+
+        calculators = [self.zones[zone_id] for zone_id in zone_ids]
+        counts = [zone_counts[zone_id] for zone_id in zone_ids]
+        # Bounds and smoothing state are read from each calculator
+        min_green = [calc.min_green for calc in calculators]
+        max_green = [calc.max_green for calc in calculators]
+        has_prev = [calc.smoothing_enabled and bool(calc.timing_history)
+                    for calc in calculators]
+        prev_green = [calc.timing_history[-1] if calc.timing_history else 0
+                      for calc in calculators]
+
+        final, band = _compute_greens_batch(
+            counts, prev_green, has_prev, min_green, max_green)
+
+        # One clock read for the whole batch
+        calculated_at = time.time()
+        levels = DynamicTimingCalculator._THRESH_LEVELS
+        return {
+            zone_id: calc._record_timing(
+                green,
+                levels[b] if b >= 0 else CongestionLevel.NONE,
+                zone_counts[zone_id],
+                calculated_at)
+            for zone_id, calc, green, b in zip(
+                zone_ids, calculators, final, band)
+        }
+
     def get_all_zones_status(self) -> Dict[str, Dict]:
         """Get status of all zones"""
         return {
             zone_id: calculator.get_statistics()
             for zone_id, calculator in self.zones.items()
         }
+
+
+if np is not None:
+    # Threshold table as arrays for the vectorized batch path
+    _THRESH_KEYS_ARR = np.asarray(DynamicTimingCalculator._THRESH_KEYS, dtype=np.int64)
+    _THRESH_GREEN_ARR = np.asarray(DynamicTimingCalculator._THRESH_GREEN, dtype=np.int64)
+
+
+def _compute_greens_batch(counts, prev_green, has_prev, min_green, max_green):
+    """
+    Final green time and threshold band for each zone
+
+    Args:
+        counts: Vehicle count per zone
+        prev_green: Previous green per zone (used where has_prev is True)
+        has_prev: Whether smoothing applies to the zone
+        min_green: Minimum green per zone
+        max_green: Maximum green per zone
+
+    Returns:
+        Tuple of (greens, bands) as lists of ints; band is -1 for counts
+        below every threshold
+    """
+    # Imported on first use: loading Numba is slow and only batch
+    # callers need it
+    from . import _kernel
+
+    step = DynamicTimingCalculator.MAX_GREEN_STEP
+    n = len(counts)
+
+    # The int64 paths would truncate non-integer bounds; those (and trees
+    # without NumPy) run the kernel as plain Python, which is exact
+    if np is None or not all(
+            type(g) is int for bounds in (min_green, max_green) for g in bounds):
+        bands = [0] * n
+        greens = [0] * n
+        compute_greens = getattr(
+            _kernel.compute_greens, 'py_func', _kernel.compute_greens)
+        compute_greens(
+            counts, prev_green, has_prev, min_green, max_green,
+            DynamicTimingCalculator._THRESH_KEYS,
+            DynamicTimingCalculator._THRESH_GREEN,
+            step, bands, greens)
+        return greens, bands
+
+    counts = np.asarray(counts, dtype=np.int64)
+    prev_green = np.asarray(prev_green, dtype=np.int64)
+    has_prev = np.asarray(has_prev, dtype=np.bool_)
+    min_green = np.asarray(min_green, dtype=np.int64)
+    max_green = np.asarray(max_green, dtype=np.int64)
+
+    if _kernel.JIT_ENABLED:
+        bands = np.empty(n, dtype=np.int64)
+        greens = np.empty(n, dtype=np.int64)
+        _kernel.compute_greens(
+            counts, prev_green, has_prev, min_green, max_green,
+            _THRESH_KEYS_ARR, _THRESH_GREEN_ARR, step, bands, greens)
+        return greens.tolist(), bands.tolist()
+
+    # Congestion band per zone; counts below every threshold get -1
+    bands = np.searchsorted(_THRESH_KEYS_ARR, counts, side='right') - 1
+    suggested = np.where(bands >= 0, _THRESH_GREEN_ARR[bands], min_green)
+
+    # Smoothing (only where there is a previous green), then bounds
+    smoothed = np.where(
+        has_prev,
+        np.maximum(prev_green - step, np.minimum(prev_green + step, suggested)),
+        suggested)
+    greens = np.maximum(min_green, np.minimum(max_green, smoothed))
+    return greens.tolist(), bands.tolist()
@@ -157,18 +157,24 @@ class SignalStateMachine:
 
         return False
 
-    def update(self) -> SignalState:
+    def update(self, now: Optional[datetime] = None) -> SignalState:
         """
         Update signal state based on elapsed time
         Should be called periodically (every 100-500ms)
 
+        Args:
+            now: Current time, so callers driving many signals can share one
+                clock read per tick (defaults to datetime.now())
+
         Returns:
             Current signal state
         """
         if not self.is_running or not self.state_start_time:
             return self.current_state
 
-        elapsed = (datetime.now() - self.state_start_time).total_seconds()
+        if now is None:
+            now = datetime.now()
+        elapsed = (now - self.state_start_time).total_seconds()
         new_state = self.current_state
 
         # Emergency mode handling
@@ -198,7 +204,7 @@ class SignalStateMachine:
         # State changed
         if new_state != self.current_state:
             self.current_state = new_state
-            self.state_start_time = datetime.now()
+            self.state_start_time = now
             self._log_state_change()
             if self.on_state_change:
                 self.on_state_change(self.signal_id, self.current_state)
@@ -217,15 +223,7 @@ class SignalStateMachine:
             elapsed = (datetime.now() - self.state_start_time).total_seconds()
 
         # Get time remaining for current state
-        time_remaining = 0
-        if self.current_state == SignalState.GREEN:
-            time_remaining = max(0, self.green_duration - elapsed)
-        elif self.current_state == SignalState.YELLOW:
-            time_remaining = max(0, self.yellow_duration - elapsed)
-        elif self.current_state == SignalState.RED:
-            time_remaining = max(0, self.red_duration - elapsed)
-        elif self.current_state == SignalState.EMERGENCY:
-            time_remaining = max(0, self.emergency_duration - elapsed)
+        time_remaining = self._remaining_after(elapsed)
 
         # Emergency info
         emergency_remaining = 0
@@ -248,6 +246,35 @@ class SignalStateMachine:
             'timestamp': datetime.now().isoformat()
         }
 
+    def time_remaining(self, now: Optional[datetime] = None) -> float:
+        """
+        Seconds left in the current state
+
+        Args:
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            Remaining seconds, rounded as in get_state_info()
+        """
+        elapsed = 0
+        if self.state_start_time:
+            if now is None:
+                now = datetime.now()
+            elapsed = (now - self.state_start_time).total_seconds()
+        return round(self._remaining_after(elapsed), 2)
+
+    def _remaining_after(self, elapsed: float) -> float:
+        """Time left in the current state after 'elapsed' seconds"""
+        if self.current_state == SignalState.GREEN:
+            return max(0, self.green_duration - elapsed)
+        elif self.current_state == SignalState.YELLOW:
+            return max(0, self.yellow_duration - elapsed)
+        elif self.current_state == SignalState.RED:
+            return max(0, self.red_duration - elapsed)
+        elif self.current_state == SignalState.EMERGENCY:
+            return max(0, self.emergency_duration - elapsed)
+        return 0
+
     def _log_state_change(self, context: str = ""):
         """Log state change to history"""
         entry = {